@@ -4,6 +4,7 @@ Database layer for tracking sent articles.
 Uses SQLite to prevent duplicate sends.
 """
 import sqlite3
+import json
 from datetime import datetime
 from pathlib import Path
 
@@ -29,6 +30,27 @@ def init_db():
         CREATE INDEX IF NOT EXISTS idx_url ON sent_articles(url)
     """)
     
+    # Per-fetch selector health for each source
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS source_health (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            source TEXT NOT NULL,
+            selector TEXT,
+            status TEXT NOT NULL,
+            reason TEXT,
+            link_count INTEGER NOT NULL DEFAULT 0,
+            valid_count INTEGER NOT NULL DEFAULT 0,
+            valid_ratio REAL NOT NULL DEFAULT 0,
+            avg_title_len REAL NOT NULL DEFAULT 0,
+            suggestions TEXT,
+            checked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_health_source ON source_health(source, id)
+    """)
+    
     conn.commit()
     conn.close()
     print(f"✅ Database initialized: {DB_PATH}")
@@ -91,6 +113,67 @@ def cleanup_old_articles(days=30):
     
     return deleted
 
+def record_source_health(source, selector, status, stats=None, reason=None, suggestions=None):
+    """Record the selector health of one source fetch."""
+    stats = stats or {}
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    
+    cursor.execute("""
+        INSERT INTO source_health
+            (source, selector, status, reason, link_count, valid_count, valid_ratio, avg_title_len, suggestions)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, (source, selector, status, reason,
+          stats.get('link_count', 0), stats.get('valid_count', 0),
+          stats.get('valid_ratio', 0.0), stats.get('avg_title_len', 0.0),
+          json.dumps(suggestions) if suggestions else None))
+    
+    conn.commit()
+    conn.close()
+
+def get_source_health_history(limit=30):
+    """
+    Get recent health rows for every source.
+    Returns {source: [row dicts, newest first]}.
+    """
+    conn = sqlite3.connect(DB_PATH)
+    conn.row_factory = sqlite3.Row
+    cursor = conn.cursor()
+    
+    cursor.execute("""
+        SELECT * FROM (
+            SELECT *, ROW_NUMBER() OVER (PARTITION BY source ORDER BY id DESC) AS rn
+            FROM source_health
+        )
+        WHERE rn <= ?
+        ORDER BY source, id DESC
+    """, (limit,))
+    
+    history = {}
+    for row in cursor:
+        row = dict(row)
+        del row['rn']
+        row['suggestions'] = json.loads(row['suggestions']) if row['suggestions'] else None
+        history.setdefault(row['source'], []).append(row)
+    
+    conn.close()
+    return history
+
+def cleanup_source_health(days=30):
+    """Remove health rows older than N days."""
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    
+    cursor.execute("""
+        DELETE FROM source_health
+        WHERE checked_at < datetime('now', '-' || ? || ' days')
+    """, (days,))
+    
+    deleted = cursor.rowcount
+    conn.commit()
+    conn.close()
+    return deleted
+
 if __name__ == "__main__":
     # Initialize DB when run directly
     init_db()
@@ -4,7 +4,6 @@ Send automotive news emails via AgentMail.
 """
 from pathlib import Path
 from datetime import datetime
-from agentmail import AgentMail
 
 # Email config
 AGENTMAIL_KEY_FILE = Path.home() / ".openclaw/workspace/agentmail_api_key"
@@ -88,7 +87,8 @@ def send_email(articles):
     with open(AGENTMAIL_KEY_FILE, 'r') as f:
         api_key = f.read().strip()
     
-    # Initialize client
+    # Initialize client (imported lazily - only needed when actually sending)
+    from agentmail import AgentMail
     client = AgentMail(api_key=api_key)
     
     # Format email
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Selector health tracking for news sources.
+
+Every fetch records how many links a source's selector matched, how many
+of them look like real headlines, and their average title length. Each
+fetch is compared against the source's recent runs so markup
+changes show up as a status instead of a silent "0 articles".
+"""
+from statistics import median
+
+# A link counts as a headline if its text is at least this long
+MIN_TITLE_LEN = 15
+
+# Baseline: median of the last N runs that produced headlines (needs at
+# least MIN runs). Degraded runs count too, so a lasting change in a
+# site's yield becomes the new baseline after about N/2 runs
+BASELINE_RUNS = 7
+MIN_BASELINE_RUNS = 3
+BASELINE_STATUSES = ('ok', 'degraded')
+
+# Degraded if yield / title length falls below this share of the baseline
+DROP_RATIO = 0.5
+
+# Degraded if fewer than this share of matched links look like headlines
+MIN_VALID_RATIO = 0.5
+
+# Skip a source after this many failed runs in a row, but probe it
+# again after every PROBE_EVERY skipped runs
+SKIP_AFTER_FAILURES = 3
+PROBE_EVERY = 3
+
+# A suggested selector must match at least this many headlines
+MIN_SUGGESTION_LINKS = 3
+
+FAILED_STATUSES = ('broken', 'error')
+
+def is_valid_link(title, href):
+    """Check whether a link looks like an article headline."""
+    if not title or not href:
+        return False
+    if href.startswith('#') or href.startswith('javascript:'):
+        return False
+    return len(title) >= MIN_TITLE_LEN
+
+def link_stats(links):
+    """Compute yield stats for the links a selector matched."""
+    titles = []
+    for link in links:
+        title = link.get_text(strip=True)
+        if is_valid_link(title, link.get('href')):
+            titles.append(title)
+
+    link_count = len(links)
+    valid_count = len(titles)
+    return {
+        'link_count': link_count,
+        'valid_count': valid_count,
+        'valid_ratio': valid_count / link_count if link_count else 0.0,
+        'avg_title_len': sum(len(t) for t in titles) / valid_count if valid_count else 0.0,
+    }
+
+def baseline(history):
+    """
+    Get a source's rolling baseline from its recent runs (newest first).
+    Returns medians of valid_count and avg_title_len, or None if there
+    are too few usable runs yet.
+    """
+    runs = [r for r in history if r['status'] in BASELINE_STATUSES][:BASELINE_RUNS]
+    if len(runs) < MIN_BASELINE_RUNS:
+        return None
+    return {
+        'valid_count': median(r['valid_count'] for r in runs),
+        'avg_title_len': median(r['avg_title_len'] for r in runs),
+    }
+
+def evaluate(stats, base):
+    """
+    Compare a fetch against the source's baseline (see baseline()).
+    Returns (status, reason) where status is 'ok', 'degraded' or 'broken'.
+    """
+    if stats['link_count'] == 0:
+        return 'broken', "selector matched no links"
+    if stats['valid_count'] == 0:
+        return 'broken', f"none of {stats['link_count']} links look like headlines"
+
+    if base:
+        if stats['valid_count'] < base['valid_count'] * DROP_RATIO:
+            return 'degraded', (f"yield dropped to {stats['valid_count']} links "
+                                f"(baseline {base['valid_count']:g})")
+
+        if stats['avg_title_len'] < base['avg_title_len'] * DROP_RATIO:
+            return 'degraded', (f"titles shrank to {stats['avg_title_len']:.0f} chars "
+                                f"(baseline {base['avg_title_len']:.0f})")
+
+    if stats['valid_ratio'] < MIN_VALID_RATIO:
+        return 'degraded', f"only {stats['valid_ratio']:.0%} of links look like headlines"
+
+    return 'ok', None
+
+def failure_streak(history):
+    """
+    Count recent failures for a source (history newest first).
+    Returns (failed_runs, skipped_runs): failed fetches in a row, ignoring
+    skipped runs, and skipped runs since the last real fetch.
+    """
+    skipped = 0
+    for row in history:
+        if row['status'] != 'skipped':
+            break
+        skipped += 1
+
+    failures = 0
+    for row in history:
+        if row['status'] == 'skipped':
+            continue
+        if row['status'] not in FAILED_STATUSES:
+            break
+        failures += 1
+
+    return failures, skipped
+
+def should_skip(history):
+    """Check whether a source has failed often enough to skip this run."""
+    failures, skipped = failure_streak(history)
+    return failures >= SKIP_AFTER_FAILURES and skipped < PROBE_EVERY
+
+def last_suggestions(history):
+    """Get the selector suggestions from the most recent run that has any."""
+    for row in history:
+        if row.get('suggestions'):
+            return row['suggestions']
+    return None
+
+def selector_history(source, history_by_source):
+    """
+    Get a source's health rows recorded with its current selector, so
+    editing a broken selector gives the source a fresh start.
+    """
+    return [r for r in history_by_source.get(source['name'], [])
+            if r['selector'] == source['selector']]
+
+def plan_sources(sources, history_by_source):
+    """
+    Decide which sources to fetch this run.
+    Returns (to_fetch, skipped). Sources whose last run was unhealthy
+    are moved to the end of to_fetch so healthy sources come first.
+    """
+    healthy, unhealthy, skipped = [], [], []
+
+    for source in sources:
+        history = selector_history(source, history_by_source)
+        if should_skip(history):
+            skipped.append(source)
+            continue
+
+        attempts = [r for r in history if r['status'] != 'skipped']
+        if attempts and attempts[0]['status'] != 'ok':
+            unhealthy.append(source)
+        else:
+            healthy.append(source)
+
+    return healthy + unhealthy, skipped
+
+def candidate_selector(link):
+    """Build a simple CSS selector describing where a link sits."""
+    parent = link.parent
+    if parent is None or parent.name in (None, '[document]', 'html', 'body'):
+        return None
+
+    classes = [c for c in parent.get('class', []) if c.replace('-', '').replace('_', '').isalnum()]
+    if classes:
+        return f"{parent.name}.{classes[0]} a"
+    return f"{parent.name} a"
+
+def suggest_selectors(soup, current_selector, limit=3):
+    """
+    Suggest replacement selectors from a parsed page.
+    Candidates are built from the parents of headline-like links and
+    ranked by how many headline-like links they match.
+    """
+    candidates = set()
+    for link in soup.find_all('a', href=True):
+        if is_valid_link(link.get_text(strip=True), link['href']):
+            selector = candidate_selector(link)
+            if selector and selector != current_selector:
+                candidates.add(selector)
+
+    scored = []
+    for selector in candidates:
+        try:
+            stats = link_stats(soup.select(selector))
+        except Exception:
+            continue  # Tag/class names that aren't valid CSS
+        if stats['valid_count'] >= MIN_SUGGESTION_LINKS and stats['valid_ratio'] >= MIN_VALID_RATIO:
+            scored.append((stats['valid_count'], stats['valid_ratio'], selector))
+
+    scored.sort(reverse=True)
+    return [selector for _, _, selector in scored[:limit]]
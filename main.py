@@ -4,14 +4,22 @@ Daily Automotive News App
 
 Fetches, deduplicates, and emails top auto news daily.
 Tracks sent articles in SQLite to avoid duplicates.
+
+Usage:
+    python main.py [send]     Full run: fetch, rank, email, mark as sent
+    python main.py fetch      Fetch and list new (unsent) articles
+    python main.py rank       Fetch and rank new articles, no email
+    python main.py dry-run    Full run without sending email or marking sent
+    python main.py stats      Show database stats
+
+Heavy dependencies (requests, bs4, openai, agentmail) are imported only
+by the subcommands that need them, so quick commands start fast.
 """
 import sys
 import os
+import argparse
 from datetime import datetime
 import db
-import scraper
-import emailer
-from openai import OpenAI
 
 def rank_articles_with_llm(articles, top_n=10):
     """
@@ -27,6 +35,7 @@ def rank_articles_with_llm(articles, top_n=10):
         return articles[:top_n]
     
     try:
+        from openai import OpenAI
         client = OpenAI(api_key=api_key)
         
         # Format articles for LLM
@@ -83,25 +92,37 @@ Just the numbers, nothing else."""
         print(f"  ⚠️  LLM ranking failed: {e}")
         return articles[:top_n]
 
-def main():
-    """Main app logic."""
+def print_header():
+    """Print the run banner."""
     print("=" * 60)
     print("🚗 Daily Automotive News App")
     print(f"📅 {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("=" * 60)
-    
+
+def fetch_new_articles(args):
+    """
+    Fetch articles from all sources and drop already-sent ones.
+    Returns None if nothing was fetched at all. Only a real send
+    (args.record) cleans up the DB and records source health.
+    """
+    import scraper
+
     # Initialize database
     db.init_db()
     
-    # Cleanup old articles (keep last 1 day so we get fresh articles daily)
-    db.cleanup_old_articles(days=1)
+    if args.record:
+        # Cleanup old articles (keep last 1 day so we get fresh articles daily)
+        db.cleanup_old_articles(days=1)
+        db.cleanup_source_health(days=30)
     
     # Fetch articles from all sources
-    all_articles = scraper.fetch_all_articles()
+    all_articles = scraper.fetch_all_articles(workers=args.workers,
+                                              memory_mb=args.worker_memory_mb,
+                                              record=args.record)
     
     if not all_articles:
         print("\n⚠️  No articles found!")
-        return 1
+        return None
     
     # Filter out already-sent articles
     print(f"\n🔍 Filtering duplicates...")
@@ -115,6 +136,46 @@ def main():
     print(f"  ✅ New articles: {len(new_articles)}")
     print(f"  ⏭️  Already sent: {len(all_articles) - len(new_articles)}")
     
+    return new_articles
+
+def print_articles(articles, heading):
+    """Print a numbered list of articles."""
+    print(f"\n📰 {heading}:")
+    for i, article in enumerate(articles, 1):
+        print(f"  {i}. {article['title'][:60]}... ({article['source']})")
+
+def cmd_fetch(args):
+    """Fetch and list new articles without ranking or sending."""
+    print_header()
+    new_articles = fetch_new_articles(args)
+    if new_articles is None:
+        return 1
+    print_articles(new_articles, f"{len(new_articles)} new articles")
+    return 0
+
+def cmd_rank(args):
+    """Fetch and rank new articles without sending."""
+    print_header()
+    new_articles = fetch_new_articles(args)
+    if new_articles is None:
+        return 1
+    if not new_articles:
+        print("\n⚠️  No new articles to rank!")
+        return 0
+    
+    print(f"\n🤖 Ranking articles with LLM...")
+    top_articles = rank_articles_with_llm(new_articles, top_n=args.top)
+    print_articles(top_articles, f"Top {len(top_articles)} articles")
+    return 0
+
+def cmd_send(args):
+    """Main app logic: fetch, rank, email and mark articles as sent."""
+    print_header()
+    
+    new_articles = fetch_new_articles(args)
+    if new_articles is None:
+        return 1
+    
     if not new_articles:
         print("\n⚠️  No new articles to send!")
         print(f"📊 Total articles in DB: {db.get_sent_count()}")
@@ -122,13 +183,17 @@ def main():
     
     # Rank articles with LLM to find most interesting
     print(f"\n🤖 Ranking articles with LLM...")
-    top_articles = rank_articles_with_llm(new_articles, top_n=10)
+    top_articles = rank_articles_with_llm(new_articles, top_n=args.top)
     
-    print(f"\n📰 Top {len(top_articles)} articles to send:")
-    for i, article in enumerate(top_articles, 1):
-        print(f"  {i}. {article['title'][:60]}... ({article['source']})")
+    print_articles(top_articles, f"Top {len(top_articles)} articles to send")
+    
+    if args.dry_run:
+        print("\n🧪 Dry run - skipping email and DB updates")
+        print("=" * 60)
+        return 0
     
     # Send email
+    import emailer
     print()
     success = emailer.send_email(top_articles)
     
@@ -146,5 +211,60 @@ def main():
     
     return 0
 
+def cmd_stats(args):
+    """Show database stats."""
+    db.init_db()
+    print(f"📊 Total sent articles: {db.get_sent_count()}")
+    return 0
+
+def add_fetch_arguments(p, default=None):
+    """
+    Add scraper worker options to a parser. Subcommands pass
+    argparse.SUPPRESS so options given before the subcommand are kept.
+    """
+    p.add_argument('--workers', type=int, default=default,
+                   help="parse pages on N worker processes (default: $SCRAPER_WORKERS or 0 = serial)")
+    p.add_argument('--worker-memory-mb', type=int, default=default,
+                   help="memory cap per worker process in MB, 0 = no cap "
+                        "(default: $SCRAPER_WORKER_MEMORY_MB or 512)")
+
+def build_parser():
+    """Build the command-line parser."""
+    parser = argparse.ArgumentParser(description="Daily Automotive News App")
+    # Bare `main.py` runs send, so it takes send's options too
+    add_fetch_arguments(parser)
+    parser.add_argument('--top', type=int, default=10, help="number of articles to send")
+    parser.set_defaults(func=cmd_send, dry_run=False, record=True)
+    subparsers = parser.add_subparsers(title="commands")
+    
+    p = subparsers.add_parser('fetch', help="fetch and list new articles")
+    add_fetch_arguments(p, argparse.SUPPRESS)
+    p.set_defaults(func=cmd_fetch, record=False)
+    
+    p = subparsers.add_parser('rank', help="fetch and rank new articles")
+    add_fetch_arguments(p, argparse.SUPPRESS)
+    p.add_argument('--top', type=int, default=argparse.SUPPRESS, help="number of articles to keep")
+    p.set_defaults(func=cmd_rank, record=False)
+    
+    p = subparsers.add_parser('send', help="fetch, rank and email articles (default)")
+    add_fetch_arguments(p, argparse.SUPPRESS)
+    p.add_argument('--top', type=int, default=argparse.SUPPRESS, help="number of articles to send")
+    p.set_defaults(func=cmd_send, record=True)
+    
+    p = subparsers.add_parser('dry-run', help="full run without sending email")
+    add_fetch_arguments(p, argparse.SUPPRESS)
+    p.add_argument('--top', type=int, default=argparse.SUPPRESS, help="number of articles to select")
+    p.set_defaults(func=cmd_send, dry_run=True, record=False)
+    
+    p = subparsers.add_parser('stats', help="show database stats")
+    p.set_defaults(func=cmd_stats)
+    
+    return parser
+
+def main(argv=None):
+    """Parse arguments and run the selected command."""
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
 if __name__ == "__main__":
     sys.exit(main())
@@ -1,15 +1,30 @@
 #!/usr/bin/env python3
 """
 Scrape automotive news from multiple sources.
+
+requests and bs4 are imported inside the fetch/parse functions so that
+loading sources (e.g. from the web UI or CLI) stays cheap.
+
+Every fetch records selector health for its source (see health.py);
+sources that keep failing are skipped and unhealthy ones fetched last.
 """
-import requests
-from bs4 import BeautifulSoup
 from datetime import datetime
 import json
+import os
 from pathlib import Path
+import db
+import health
 
 SOURCES_FILE = Path(__file__).parent / "sources.json"
 
+# Parallel fetch/parse config (0 workers = fetch and parse serially)
+PARSE_WORKERS = int(os.getenv('SCRAPER_WORKERS', '0'))
+WORKER_MEMORY_MB = int(os.getenv('SCRAPER_WORKER_MEMORY_MB', '512'))
+FETCH_THREADS = int(os.getenv('SCRAPER_FETCH_THREADS', '8'))
+
+# Rebuilds of a crashed parse worker pool allowed per run
+MAX_POOL_RESTARTS = 3
+
 def load_sources():
     """Load sources from JSON file."""
     if SOURCES_FILE.exists():
@@ -30,9 +45,12 @@ def load_sources():
         {"name": "TechCrunch Transportation", "url": "https://techcrunch.com/category/transportation/", "selector": "h2 a, h3 a"}
     ]
 
-def fetch_articles_from_source(source):
-    """Fetch articles from a single source."""
-    articles = []
+def fetch_page(source):
+    """
+    Download a source page.
+    Returns (html_bytes, encoding), or None on failure.
+    """
+    import requests
     
     try:
         response = requests.get(source["url"], timeout=10, headers={
@@ -41,51 +59,335 @@ def fetch_articles_from_source(source):
         
         if response.status_code != 200:
             print(f"  ❌ {source['name']}: HTTP {response.status_code}")
-            return articles
+            return None
         
-        soup = BeautifulSoup(response.text, 'html.parser')
-        links = soup.select(source["selector"])
+        return response.content, response.encoding
         
-        for link in links[:10]:  # Top 10 from each source
-            title = link.get_text(strip=True)
-            href = link.get('href')
-            
-            if not href or not title:
-                continue
-            
-            # Make absolute URL
-            if href.startswith('/'):
-                from urllib.parse import urljoin
-                href = urljoin(source["url"], href)
-            
-            articles.append({
-                'title': title,
-                'url': href,
-                'source': source['name']
-            })
+    except Exception as e:
+        print(f"  ❌ {source['name']}: {str(e)[:50]}")
+        return None
+
+def parse_articles(html, encoding, source, base=None):
+    """
+    Parse article links out of a downloaded page.
+    Returns (articles, stats, suggestions): a list of (title, url,
+    source_name) tuples, the selector health stats, and replacement
+    selectors if the stats look unhealthy against base (see
+    health.baseline) - kept compact so they are cheap to send back from
+    a worker process.
+    """
+    from bs4 import BeautifulSoup
+    from urllib.parse import urljoin
+    
+    soup = BeautifulSoup(html, 'html.parser', from_encoding=encoding)
+    links = soup.select(source["selector"])
+    stats = health.link_stats(links)
+    
+    articles = []
+    for link in links[:10]:  # Top 10 from each source
+        title = link.get_text(strip=True)
+        href = link.get('href')
         
-        print(f"  ✅ {source['name']}: {len(articles)} articles")
+        if not href or not title:
+            continue
         
+        # Make absolute URL
+        if href.startswith('/'):
+            href = urljoin(source["url"], href)
+        
+        articles.append((title, href, source['name']))
+    
+    # Look for a better selector while the page is already parsed
+    suggestions = None
+    status, _ = health.evaluate(stats, base)
+    if status != 'ok':
+        try:
+            suggestions = health.suggest_selectors(soup, source["selector"])
+        except Exception as e:
+            print(f"  ⚠️  {source['name']}: selector suggestions failed: {str(e)[:50]}")
+    
+    return articles, stats, suggestions
+
+def to_article_dicts(rows):
+    """Convert (title, url, source) tuples to article dicts."""
+    return [{'title': title, 'url': url, 'source': name} for title, url, name in rows]
+
+def record_fetch(source, page, parsed, history, reason=None, record=True):
+    """
+    Check a source's selector health, record it and report the result.
+    page is the fetched (html, encoding), parsed the parse_articles()
+    result; either is None if that step failed, with reason saying why.
+    With record=False the result is only reported, not stored.
+    Returns article dicts.
+    """
+    name = source['name']
+    
+    if page is None or parsed is None:
+        reason = reason or ("fetch failed" if page is None else "parse failed")
+        if record:
+            db.record_source_health(name, source['selector'], 'error', reason=reason)
+        return []
+    
+    rows, stats, suggestions = parsed
+    status, reason = health.evaluate(stats, health.baseline(history))
+    
+    if record:
+        db.record_source_health(name, source['selector'], status, stats, reason, suggestions)
+    articles = to_article_dicts(rows)
+    
+    if status == 'ok':
+        print(f"  ✅ {name}: {len(articles)} articles")
+    else:
+        print(f"  ⚠️  {name}: {len(articles)} articles ({status}: {reason})")
+        if suggestions:
+            print(f"     💡 Try selector: {', '.join(suggestions)}")
+    
+    return articles
+
+def _parse_in_process(source, page, history, record=True):
+    """Parse a fetched page in this process and record the result."""
+    try:
+        parsed = parse_articles(page[0], page[1], source, health.baseline(history))
+    except MemoryError:
+        print(f"  ❌ {source['name']}: parse failed: out of memory")
+        return record_fetch(source, page, None, history, reason="parse failed: out of memory",
+                            record=record)
     except Exception as e:
         print(f"  ❌ {source['name']}: {str(e)[:50]}")
+        parsed = None
     
-    return articles
+    return record_fetch(source, page, parsed, history, record=record)
 
-def fetch_all_articles():
-    """Fetch articles from all sources."""
-    print("🔍 Fetching automotive news...")
+def fetch_articles_from_source(source, history=(), record=True):
+    """Fetch articles from a single source."""
+    page = fetch_page(source)
+    if page is None:
+        return record_fetch(source, None, None, history, record=record)
+    
+    return _parse_in_process(source, page, history, record)
+
+def _limit_worker_memory(memory_mb):
+    """
+    Process pool initializer: cap the worker's address space.
+    RLIMIT_AS limits virtual memory (VmSize), not RSS, so the cap has to
+    leave room for the interpreter and bs4 on top of the pages parsed.
+    """
+    if not memory_mb:
+        return
+    try:
+        import resource
+    except ImportError:
+        return  # Not available on Windows
+    limit = memory_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+def _worker_context():
+    """
+    Start method for parse workers. Workers must not be forked from this
+    process: it is running fetch threads, so a forked child would inherit
+    their stacks and malloc arenas (throwing off the memory cap) and any
+    locks they hold (risking a deadlock).
+    """
+    import multiprocessing
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return multiprocessing.get_context('spawn')
+
+def fetch_all_articles_parallel(sources, workers, memory_mb=WORKER_MEMORY_MB, history_by_source=None,
+                                record=True):
+    """
+    Fetch pages on a thread pool and parse them on a process pool.
+    Network I/O stays in this process; only raw page bytes go to the
+    workers and only (title, url, source) tuples plus selector health
+    stats and suggestions come back.
+    
+    At most `workers` pages are handed to the pool at a time, so when a
+    worker dies (e.g. hits its memory cap) only the pages that were
+    running are lost with it. Those are re-parsed one at a time on a
+    separate single-worker pool to find the culprit, while the main pool
+    is rebuilt and carries on with the queue. After MAX_POOL_RESTARTS
+    rebuilds, the rest of the queue is parsed in this process.
+    """
+    from collections import deque
+    from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+    from concurrent.futures.process import BrokenProcessPool
+    
+    print(f"  ⚙️  Using {workers} parse workers"
+          + (f" ({memory_mb} MB address space cap each)" if memory_mb else ""))
     
-    sources = load_sources()
+    def new_parse_pool(max_workers):
+        return ProcessPoolExecutor(max_workers=max_workers,
+                                   mp_context=_worker_context(),
+                                   initializer=_limit_worker_memory,
+                                   initargs=(memory_mb,))
+    
+    history_by_source = history_by_source or {}
+    results = {}
+    queue = deque()      # (source index, page) waiting for a worker
+    running = {}         # future -> (source index, page) on the main pool
+    suspects = deque()   # (source index, page) running when a worker died
+    isolating = {}       # future -> (source index, page) on the isolation pool
+    main_broken = False
+    restarts = 0
+    finished = False
+    
+    fetch_pool = ThreadPoolExecutor(max_workers=FETCH_THREADS)
+    parse_pool = new_parse_pool(workers)
+    isolation_pool = None
+    
+    def history_for(i):
+        return health.selector_history(sources[i], history_by_source)
+    
+    def submit(pool, i, page):
+        return pool.submit(parse_articles, page[0], page[1], sources[i],
+                           health.baseline(history_for(i)))
+    
+    def give_up(i, page, message):
+        # Counts toward the source's failure streak: a page that keeps
+        # crashing workers gets skipped like any other broken source
+        source = sources[i]
+        print(f"  ❌ {source['name']}: parse failed: {message}")
+        results[i] = record_fetch(source, page, None, history_for(i),
+                                  reason=f"parse failed: {message}", record=record)
+    
+    def collect(future, i, page, alone):
+        """Record a finished parse. Returns False if its pool broke."""
+        try:
+            parsed = future.result()
+        except BrokenProcessPool:
+            if alone:
+                give_up(i, page, "crashed a parse worker")
+            else:
+                suspects.append((i, page))
+            return False
+        except MemoryError:
+            give_up(i, page, "worker hit its memory cap")
+        except Exception as e:
+            give_up(i, page, str(e)[:50] or type(e).__name__)
+        else:
+            results[i] = record_fetch(sources[i], page, parsed, history_for(i), record=record)
+        return True
+    
+    try:
+        fetches = {fetch_pool.submit(fetch_page, source): i for i, source in enumerate(sources)}
+        
+        while fetches or queue or running or suspects or isolating:
+            # Rebuild the main pool once everything it was running is back
+            if main_broken and not running:
+                parse_pool.shutdown(wait=False, cancel_futures=True)
+                if restarts < MAX_POOL_RESTARTS:
+                    restarts += 1
+                    print(f"  ⚠️  Parse worker crashed - restarting pool ({restarts}/{MAX_POOL_RESTARTS})")
+                    parse_pool = new_parse_pool(workers)
+                else:
+                    print("  ⚠️  Parse workers keep crashing - parsing the rest in-process")
+                    parse_pool = None
+                main_broken = False
+            
+            # Keep the main pool at most `workers` deep
+            while queue and parse_pool is not None and not main_broken and len(running) < workers:
+                i, page = queue.popleft()
+                try:
+                    running[submit(parse_pool, i, page)] = (i, page)
+                except BrokenProcessPool:
+                    queue.appendleft((i, page))
+                    main_broken = True
+            
+            if parse_pool is None:
+                while queue:
+                    i, page = queue.popleft()
+                    results[i] = _parse_in_process(sources[i], page, history_for(i), record)
+            
+            # Re-run pages from a crashed batch one at a time
+            if suspects and not isolating:
+                if isolation_pool is None:
+                    isolation_pool = new_parse_pool(1)
+                i, page = suspects.popleft()
+                isolating[submit(isolation_pool, i, page)] = (i, page)
+            
+            pending = list(fetches) + list(running) + list(isolating)
+            if not pending:
+                continue
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            
+            for future in done:
+                if future in fetches:
+                    i = fetches.pop(future)
+                    page = future.result()
+                    if page is None:
+                        results[i] = record_fetch(sources[i], None, None, [], record=record)
+                    else:
+                        queue.append((i, page))
+                elif future in running:
+                    i, page = running.pop(future)
+                    if not collect(future, i, page, alone=False):
+                        main_broken = True
+                else:
+                    i, page = isolating.pop(future)
+                    if not collect(future, i, page, alone=True):
+                        isolation_pool.shutdown(wait=False, cancel_futures=True)
+                        isolation_pool = None
+        
+        finished = True
+    except KeyboardInterrupt:
+        print("\n  ⚠️  Interrupted - shutting down workers...")
+        raise
+    finally:
+        # Wait for a clean exit only when all work is done
+        fetch_pool.shutdown(wait=finished, cancel_futures=not finished)
+        for pool in (parse_pool, isolation_pool):
+            if pool is not None:
+                pool.shutdown(wait=finished, cancel_futures=not finished)
+    
+    # Keep source order stable regardless of completion order
     all_articles = []
+    for i in sorted(results):
+        all_articles.extend(results[i])
+    return all_articles
+
+def fetch_all_articles(workers=None, memory_mb=None, record=True):
+    """
+    Fetch articles from all sources.
+    With workers > 0, parsing runs on a process pool
+    (see fetch_all_articles_parallel); otherwise sources are fetched
+    one by one in this process. None means use the SCRAPER_* env config.
+    With record=False nothing is written to source_health, so trial runs
+    don't move a source's failure streak or probe schedule.
+    """
+    print("🔍 Fetching automotive news...")
+    
+    if workers is None:
+        workers = PARSE_WORKERS
+    if memory_mb is None:
+        memory_mb = WORKER_MEMORY_MB
+    
+    # Skip sources that keep failing, fetch unhealthy ones last
+    history_by_source = db.get_source_health_history()
+    sources, skipped = health.plan_sources(load_sources(), history_by_source)
+    
+    for source in skipped:
+        history = health.selector_history(source, history_by_source)
+        failures, _ = health.failure_streak(history)
+        reason = f"{failures} failed runs in a row"
+        print(f"  ⏭️  {source['name']}: skipped ({reason})")
+        if record:
+            db.record_source_health(source['name'], source['selector'], 'skipped', reason=reason,
+                                    suggestions=health.last_suggestions(history))
     
-    for source in sources:
-        articles = fetch_articles_from_source(source)
-        all_articles.extend(articles)
+    if workers > 0:
+        all_articles = fetch_all_articles_parallel(sources, workers, memory_mb, history_by_source, record)
+    else:
+        all_articles = []
+        for source in sources:
+            history = health.selector_history(source, history_by_source)
+            articles = fetch_articles_from_source(source, history, record)
+            all_articles.extend(articles)
     
     print(f"\n📰 Total articles fetched: {len(all_articles)}")
     return all_articles
 
 if __name__ == "__main__":
+    db.init_db()
     articles = fetch_all_articles()
     for i, article in enumerate(articles[:5], 1):
         print(f"{i}. {article['title']} ({article['source']})")
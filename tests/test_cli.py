@@ -0,0 +1,30 @@
+"""
+Command-line parsing for main.py.
+"""
+import main
+
+def parse(*argv):
+    return main.build_parser().parse_args(list(argv))
+
+def test_bare_command_is_send_with_send_options():
+    args = parse('--workers', '4', '--top', '5', '--worker-memory-mb', '0')
+    assert args.func is main.cmd_send
+    assert (args.workers, args.top, args.worker_memory_mb) == (4, 5, 0)
+    assert args.record and not args.dry_run
+
+def test_options_before_and_after_subcommand():
+    assert parse('--workers', '4', 'send').workers == 4
+    assert parse('send', '--workers', '3').workers == 3
+    assert parse('send').workers is None
+    assert parse('rank').top == 10
+
+def test_only_send_records():
+    assert parse().record
+    assert parse('send').record
+    for command in ('fetch', 'rank', 'dry-run'):
+        assert not parse(command).record, command
+
+def test_dry_run():
+    args = parse('dry-run', '--top', '3')
+    assert args.func is main.cmd_send
+    assert args.dry_run and args.top == 3
@@ -0,0 +1,106 @@
+"""
+Selector health: stats, baseline, skip cadence and source planning.
+"""
+import pytest
+
+import db
+import health
+
+def row(status, valid_count=10, avg_title_len=40.0, selector='h2 a'):
+    return {'status': status, 'selector': selector, 'valid_count': valid_count,
+            'avg_title_len': avg_title_len, 'suggestions': None}
+
+def stats(link_count=10, valid_count=10, avg_title_len=40.0):
+    return {'link_count': link_count, 'valid_count': valid_count,
+            'valid_ratio': valid_count / link_count if link_count else 0.0,
+            'avg_title_len': avg_title_len}
+
+def test_evaluate_without_baseline():
+    assert health.evaluate(stats(), None) == ('ok', None)
+    assert health.evaluate(stats(0, 0), None)[0] == 'broken'
+    assert health.evaluate(stats(10, 0), None)[0] == 'broken'
+    assert health.evaluate(stats(10, 4), None)[0] == 'degraded'
+
+def test_evaluate_against_baseline():
+    base = {'valid_count': 10, 'avg_title_len': 40.0}
+    assert health.evaluate(stats(10, 10), base)[0] == 'ok'
+    assert health.evaluate(stats(4, 4), base)[0] == 'degraded'
+    assert health.evaluate(stats(10, 10, avg_title_len=15.0), base)[0] == 'degraded'
+
+def test_baseline_needs_enough_runs():
+    assert health.baseline([row('ok'), row('ok')]) is None
+    assert health.baseline([row('ok')] * 3) == {'valid_count': 10, 'avg_title_len': 40.0}
+
+def test_baseline_ignores_failed_runs():
+    history = [row('broken', 0), row('error', 0), row('skipped', 0)] + [row('ok')] * 3
+    assert health.baseline(history)['valid_count'] == 10
+
+def test_baseline_rolls_to_new_yield_level():
+    history = [row('ok', 10)] * 5
+    statuses = []
+    for _ in range(8):
+        status, _ = health.evaluate(stats(3, 3), health.baseline(history))
+        statuses.append(status)
+        history.insert(0, row(status, 3))
+    assert statuses[0] == 'degraded'
+    assert statuses[-1] == 'ok'
+
+def test_skip_after_failures_and_probe_cadence():
+    history = [row('broken')] * (health.SKIP_AFTER_FAILURES - 1)
+    assert not health.should_skip(history)
+
+    history.insert(0, row('error'))
+    assert health.should_skip(history)
+
+    for _ in range(health.PROBE_EVERY - 1):
+        history.insert(0, row('skipped'))
+        assert health.should_skip(history)
+
+    # Due for a probe, and skipped again if the probe fails
+    history.insert(0, row('skipped'))
+    assert not health.should_skip(history)
+    history.insert(0, row('broken'))
+    assert health.should_skip(history)
+
+def test_success_resets_failure_streak():
+    history = [row('ok')] + [row('broken')] * 5
+    assert health.failure_streak(history) == (0, 0)
+    assert not health.should_skip(history)
+
+def test_selector_history_resets_on_selector_change():
+    history_by_source = {'A': [row('broken', selector='h5 a')] * 5}
+    source = {'name': 'A', 'selector': 'h2 a'}
+    assert health.selector_history(source, history_by_source) == []
+
+    to_fetch, skipped = health.plan_sources([source], history_by_source)
+    assert to_fetch == [source] and skipped == []
+
+def test_plan_sources_orders_and_skips():
+    sources = [{'name': name, 'selector': 'h2 a'} for name in ('Sick', 'Dead', 'Fine', 'New')]
+    history_by_source = {
+        'Sick': [row('degraded'), row('ok')],
+        'Dead': [row('broken')] * health.SKIP_AFTER_FAILURES,
+        'Fine': [row('skipped'), row('ok')],
+    }
+    to_fetch, skipped = health.plan_sources(sources, history_by_source)
+    assert [s['name'] for s in to_fetch] == ['Fine', 'New', 'Sick']
+    assert [s['name'] for s in skipped] == ['Dead']
+
+def test_history_is_limited_per_source(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, 'DB_PATH', tmp_path / "auto_news.db")
+    db.init_db()
+    for i in range(10):
+        db.record_source_health('A', 'h2 a', 'ok', stats(valid_count=i))
+        db.record_source_health('B', 'h2 a', 'broken', suggestions=['div.x a'])
+
+    history = db.get_source_health_history(limit=3)
+    assert [r['valid_count'] for r in history['A']] == [9, 8, 7]
+    assert history['B'][0]['suggestions'] == ['div.x a']
+    assert len(history['B']) == 3
+
+def test_suggest_selectors():
+    bs4 = pytest.importorskip('bs4')
+    items = ''.join(f"<div class='card'><a href='/s{i}'>Automaker unveils new model {i}</a></div>"
+                    for i in range(5))
+    soup = bs4.BeautifulSoup(f"<nav><a href='/'>Home</a></nav>{items}", 'html.parser')
+    assert health.suggest_selectors(soup, 'h2 a') == ['div.card a']
@@ -0,0 +1,87 @@
+"""
+Parallel fetch/parse: worker crashes, pool rebuilds and in-process fallback.
+
+Pages are faked, and parse_articles is swapped for fake_parse, which
+kills its worker on pages marked CRASH. Workers import this module to
+unpickle fake_parse, so it must stay importable and cheap.
+"""
+import os
+import sqlite3
+import time
+
+import pytest
+
+import db
+import scraper
+
+# Set once in the test process; workers inherit it from the environment
+os.environ.setdefault('SCRAPER_TEST_PARENT_PID', str(os.getpid()))
+
+def in_worker():
+    return str(os.getpid()) != os.environ['SCRAPER_TEST_PARENT_PID']
+
+def fake_parse(html, encoding, source, base=None):
+    if html == b"CRASH":
+        if in_worker():
+            os._exit(1)
+        raise RuntimeError("would crash")
+    time.sleep(0.02)  # Keep several pages in flight at once
+    stats = {'link_count': 3, 'valid_count': 3, 'valid_ratio': 1.0, 'avg_title_len': 40.0}
+    return [(f"Headline from {source['name']} today", f"https://example.com/{source['name']}",
+             source['name'])], stats, None
+
+@pytest.fixture
+def catalog(tmp_path, monkeypatch):
+    """Point the scraper at a temp DB and 12 fake sources; returns the set of crashing names."""
+    monkeypatch.setattr(db, 'DB_PATH', tmp_path / "auto_news.db")
+    db.init_db()
+
+    bad = set()
+    sources = [{'name': f"s{i}", 'url': f"https://example.com/{i}", 'selector': 'h2 a'}
+               for i in range(12)]
+    monkeypatch.setattr(scraper, 'load_sources', lambda: sources)
+    monkeypatch.setattr(scraper, 'fetch_page',
+                        lambda source: (b"CRASH" if source['name'] in bad else b"ok", None))
+    monkeypatch.setattr(scraper, 'parse_articles', fake_parse)
+    return bad
+
+def latest_statuses():
+    conn = sqlite3.connect(db.DB_PATH)
+    rows = conn.execute("""
+        SELECT source, status, reason FROM source_health
+        WHERE id IN (SELECT MAX(id) FROM source_health GROUP BY source)
+    """).fetchall()
+    conn.close()
+    return {source: (status, reason) for source, status, reason in rows}
+
+def test_all_pages_parsed(catalog):
+    articles = scraper.fetch_all_articles(workers=3, memory_mb=0)
+    assert [a['source'] for a in articles] == [f"s{i}" for i in range(12)]
+    assert {status for status, _ in latest_statuses().values()} == {'ok'}
+
+def test_crash_only_loses_the_crashing_pages(catalog):
+    catalog.update({'s1', 's5', 's9'})
+    articles = scraper.fetch_all_articles(workers=3, memory_mb=0)
+
+    assert {a['source'] for a in articles} == {f"s{i}" for i in range(12)} - catalog
+    statuses = latest_statuses()
+    for name in catalog:
+        assert statuses[name] == ('error', "parse failed: crashed a parse worker")
+    assert sum(status == 'ok' for status, _ in statuses.values()) == 9
+
+def test_falls_back_to_in_process_after_restart_limit(catalog, monkeypatch, capsys):
+    monkeypatch.setattr(scraper, 'MAX_POOL_RESTARTS', 0)
+    catalog.add('s0')
+    articles = scraper.fetch_all_articles(workers=2, memory_mb=0)
+
+    assert "parsing the rest in-process" in capsys.readouterr().out
+    assert {a['source'] for a in articles} == {f"s{i}" for i in range(1, 12)}
+    assert latest_statuses()['s0'][0] == 'error'
+
+def test_crashing_source_gets_skipped(catalog):
+    catalog.add('s3')
+    for _ in range(scraper.health.SKIP_AFTER_FAILURES):
+        scraper.fetch_all_articles(workers=2, memory_mb=0)
+
+    scraper.fetch_all_articles(workers=2, memory_mb=0)
+    assert latest_statuses()['s3'][0] == 'skipped'
@@ -0,0 +1,57 @@
+"""
+Startup-time checks for the CLI.
+
+Scheduled runs start main.py often, so quick commands must not import
+the heavy dependencies (requests, bs4, openai, agentmail).
+"""
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO_DIR = Path(__file__).parent.parent
+
+HEAVY_MODULES = ('requests', 'bs4', 'openai', 'agentmail')
+
+# Generous enough for a slow CI box; importing any heavy dependency
+# blows well past it
+STARTUP_BUDGET = 1.5
+
+def run_python(code):
+    """Run code in a fresh interpreter from the repo dir; returns (result, seconds)."""
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-c', code], cwd=REPO_DIR,
+                            capture_output=True, text=True, timeout=30)
+    elapsed = time.perf_counter() - start
+    assert result.returncode == 0, result.stderr
+    return result, elapsed
+
+def test_import_main_skips_heavy_dependencies():
+    result, _ = run_python(
+        "import sys, main\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n")
+    assert result.stdout.strip() == ""
+
+def test_help_is_fast():
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, 'main.py', '--help'], cwd=REPO_DIR,
+                            capture_output=True, text=True, timeout=30)
+    elapsed = time.perf_counter() - start
+
+    assert result.returncode == 0, result.stderr
+    assert 'dry-run' in result.stdout
+    assert elapsed < STARTUP_BUDGET
+
+def test_stats_is_fast_and_light(tmp_path):
+    db_path = tmp_path / "auto_news.db"
+    result, elapsed = run_python(
+        "import sys, db, main\n"
+        f"db.DB_PATH = {str(db_path)!r}\n"
+        "code = main.main(['stats'])\n"
+        f"print('HEAVY:' + ','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n"
+        "sys.exit(code)\n")
+
+    assert "Total sent articles: 0" in result.stdout
+    assert "HEAVY:\n" in result.stdout
+    assert db_path.exists()
+    assert elapsed < STARTUP_BUDGET
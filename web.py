@@ -112,7 +112,22 @@ def index():
 def sources():
     """Manage sources."""
     sources = load_sources()
-    return render_template('sources.html', sources=sources)
+    
+    # Latest selector health per source (recorded by the scraper)
+    conn = get_db()
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT * FROM source_health
+        WHERE id IN (SELECT MAX(id) FROM source_health GROUP BY source)
+    """)
+    health = {}
+    for row in cursor.fetchall():
+        row = dict(row)
+        row['suggestions'] = json.loads(row['suggestions']) if row['suggestions'] else []
+        health[row['source']] = row
+    conn.close()
+    
+    return render_template('sources.html', sources=sources, health=health)
 
 @app.route('/sources/add', methods=['POST'])
 @login_required